@@ -1,11 +1,21 @@
 
-import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 import uuid
 import datetime
 import pytz
 
-from requests import request
+from requests import Session, RequestException
+from requests.adapters import HTTPAdapter
+
+from .codec import get_codec, accept_encoding
+from .cache import CacheEntry, MemoryCache, DiskCache, cache_key
+from .resilience import CircuitBreaker, CircuitOpenError, LatencyTracker
+from .cursor import EntriesCursor
+from .collector import collect_spaces
+from .archive import TimeEntryArchive
 
 NAME = 'TimeularAPI'
 
@@ -17,7 +27,14 @@ class TimeularAPI(object):
             api_key, api_secret,
             timezone,
             timeout = 5,
-            debug = False
+            debug = False,
+            json_codec = None,
+            cache = None,
+            circuit_breaker = None,
+            hedge_requests = False,
+            hedge_quantile = 0.95,
+            hedge_budget = 0.1,
+            pool_size = 10
     ):
         self.__apikey__ = api_key
         self.__apisecret__ = api_secret
@@ -28,6 +45,41 @@ class TimeularAPI(object):
         self.__baseurl__ = "https://api.timeular.com/api/v3/"
         self.__default_space_id__ = None
         self.__user_id__ = None
+        self.__auth_lock__ = threading.RLock()
+        self.__metrics_lock__ = threading.Lock()
+        self.__session__ = Session()
+        self.__session__.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.__session__.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.__codec__ = get_codec(json_codec)
+        self.__accept_encoding__ = accept_encoding()
+        self.__cache__ = cache
+        self.__breaker_config__ = circuit_breaker
+        self.__breakers__ = {}
+        self.__stale__ = MemoryCache() if circuit_breaker is not None else None
+        self.__latencies__ = {}
+        self.__hedge_quantile__ = hedge_quantile
+        self.__hedge_budget__ = hedge_budget
+        self.__in_flight__ = 0
+        self.__hedges_in_flight__ = 0
+        self.__executor__ = ThreadPoolExecutor(max_workers=pool_size) if hedge_requests else None
+        self.__hedge_executor__ = ThreadPoolExecutor(max_workers=pool_size) if hedge_requests else None
+        self.__metrics__ = {
+            'requests': 0,
+            'request_bytes': 0,
+            'response_bytes': 0,
+            'wire_bytes': 0,
+            'wire_decoded_bytes': 0,
+            'wire_unmeasured': 0,
+            'compressed_responses': 0,
+            'encode_seconds': 0.0,
+            'decode_seconds': 0.0,
+            'not_modified': 0,
+            'stale_served': 0,
+            'circuit_rejected': 0,
+            'hedged': 0,
+            'hedge_wins': 0,
+            'token_refreshes': 0,
+        }
 
     def __enter__(self):
         logging.debug('start __enter__')
@@ -39,12 +91,289 @@ class TimeularAPI(object):
     def __exit__(self, exc_type, exc_val, exc_tb):
         logging.debug('start __exit_')
         self.logout()
+        if self.__executor__ is not None:
+            self.__executor__.shutdown(wait=False)
+            self.__hedge_executor__.shutdown(wait=False)
+        self.__session__.close()
         logging.debug('end __exit_')
 
     def __get_user_ids__(self):
-        response = self.get_user()
-        self.__default_space_id__ = int(response['defaultSpaceId'])
-        self.__user_id__ = int(response['userId'])
+        if self.__user_id__ is None:
+            with self.__auth_lock__:
+                if self.__user_id__ is None:
+                    response = self.get_user()
+                    self.__default_space_id__ = int(response['defaultSpaceId'])
+                    self.__user_id__ = int(response['userId'])
+
+    def __refresh_token__(self, expired_token):
+        """
+        Sign in again after a 401, once for all threads holding the expired token.
+
+        Threads that get a 401 with a token that was already replaced just retry.
+        """
+        with self.__auth_lock__:
+            if self.__token__ == expired_token:
+                logging.info('__refresh_token__ - token expired, signing in again')
+                self.__token__ = None
+                self.__count__(token_refreshes=1)
+                self.sign_in()
+            return self.__token__
+
+    def __count__(self, **counters):
+        with self.__metrics_lock__:
+            for name, value in counters.items():
+                self.__metrics__[name] += value
+
+    def __api_request__(self, method, url, data=None, headers=None):
+        """
+        Send a request to the Timeular API and decode the JSON response.
+
+        Requests carrying an `Authorization` header sign in lazily and use the
+        current token; on a 401 the token is refreshed once and the call retried.
+
+        The body is encoded with the configured JSON codec; GET requests are sent
+        without a body. Compressed responses are negotiated via `Accept-Encoding`.
+
+        If a cache is configured, GET requests carry the stored validators and a
+        304 response returns the cached object. Cached objects are shared between
+        calls and must not be mutated.
+
+        If circuit breakers are configured, calls to an endpoint whose breaker is
+        open return the last successful GET response for the URL, or raise
+        `CircuitOpenError` if there is none.
+
+        Args:
+            method (str): HTTP method, e.g. 'GET' or 'POST'.
+            url (str): Full URL of the endpoint.
+            data (dict, optional): Request body, ignored for GET requests.
+            headers (dict, optional): Request headers.
+
+        Returns:
+            dict: The decoded response body, or None if the response is empty.
+
+        Raises:
+            CircuitOpenError: If the endpoint's breaker is open and no stale data exists.
+        """
+        headers = dict(headers or {})
+        headers.setdefault('Accept-Encoding', self.__accept_encoding__)
+        token = None
+        if 'Authorization' in headers:
+            self.sign_in()
+            token = self.__token__
+            headers['Authorization'] = f'Bearer {token}'
+
+        body = None
+        encode_seconds = 0.0
+        if method != 'GET' and data is not None:
+            started = time.perf_counter()
+            body = self.__codec__.dumps(data)
+            encode_seconds = time.perf_counter() - started
+
+        key = cache_key(self.__apikey__, url) if method == 'GET' else None
+        endpoint = self.__endpoint__(method, url)
+        breaker = self.__breaker__(endpoint)
+        if breaker is not None and not breaker.allow():
+            stale = self.__stale__.get(key) if key is not None else None
+            if stale is not None:
+                logging.info('__api_request__ - circuit open, serving stale: %s', endpoint)
+                self.__count__(stale_served=1)
+                return stale.parsed
+            self.__count__(circuit_rejected=1)
+            raise CircuitOpenError(f'circuit open for {endpoint}')
+
+        entry = None
+        if key is not None and self.__cache__ is not None:
+            entry = self.__cache__.get(key)
+            if entry is not None:
+                headers.update(entry.validators())
+
+        try:
+            started = time.perf_counter()
+            response = self.__send__(method, url, body, headers, endpoint)
+            if response.status_code == 401 and token is not None:
+                token = self.__refresh_token__(token)
+                headers['Authorization'] = f'Bearer {token}'
+                started = time.perf_counter()
+                response = self.__send__(method, url, body, headers, endpoint)
+        except Exception:
+            if breaker is not None:
+                breaker.record(False)
+            raise
+        elapsed = time.perf_counter() - started
+
+        if breaker is not None:
+            breaker.record(response.status_code < 500, elapsed)
+        if response.status_code < 500:
+            self.__latency__(endpoint).add(elapsed)
+
+        content = response.content
+        started = time.perf_counter()
+        if entry is not None and response.status_code == 304:
+            if entry.parsed is None:
+                entry.parsed = self.__codec__.loads(entry.content)
+            parsed = entry.parsed
+            self.__count__(not_modified=1)
+        else:
+            parsed = self.__codec__.loads(content) if content else None
+        decode_seconds = time.perf_counter() - started
+
+        if key is not None and response.status_code in (200, 304):
+            if self.__stale__ is not None:
+                self.__stale__.set(key, CacheEntry(content, parsed=parsed))
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if self.__cache__ is not None and response.status_code == 200 \
+                    and (etag is not None or last_modified is not None):
+                self.__cache__.set(key, CacheEntry(content, etag, last_modified, parsed))
+
+        encoded = response.headers.get('Content-Encoding')
+        wire_bytes = self.__wire_bytes__(response, content, encoded)
+        self.__count__(
+            requests=1,
+            request_bytes=len(body) if body else 0,
+            response_bytes=len(content),
+            wire_bytes=wire_bytes or 0,
+            wire_decoded_bytes=len(content) if wire_bytes is not None else 0,
+            wire_unmeasured=1 if wire_bytes is None else 0,
+            compressed_responses=1 if encoded else 0,
+            encode_seconds=encode_seconds,
+            decode_seconds=decode_seconds,
+        )
+
+        return parsed
+
+    @staticmethod
+    def __wire_bytes__(response, content, encoded):
+        """
+        Return the size of the response body as transferred, or None if unknown.
+
+        urllib3 counts the raw bytes read, except for chunked responses; those
+        are only measurable when uncompressed.
+        """
+        tell = getattr(response.raw, 'tell', None)
+        raw_bytes = tell() if tell is not None else 0
+        if raw_bytes:
+            return raw_bytes
+        if not encoded:
+            return len(content)
+        if 'Content-Length' in response.headers:
+            return int(response.headers['Content-Length'])
+        return None
+
+    def __send__(self, method, url, body, headers, endpoint):
+        """
+        Send the HTTP request, hedging idempotent GETs if enabled.
+
+        A hedged GET sends its first attempt from the attempt executor. Once that
+        attempt has been running longer than the endpoint's latency quantile, a
+        second attempt is sent from a separate hedge executor, as long as fewer than
+        `hedge_budget` of the in-flight calls are already hedged, and whichever
+        succeeds first is returned. The delay is timed from when the first attempt
+        starts, so queueing for a worker does not trigger hedges.
+        """
+        delay = None
+        if self.__executor__ is not None and method == 'GET':
+            delay = self.__latency__(endpoint).quantile(self.__hedge_quantile__)
+
+        if delay is None:
+            return self.__session__.request(method,
+                url,
+                data=body,
+                headers=headers,
+                timeout=self.__timeout__
+            )
+
+        with self.__metrics_lock__:
+            self.__in_flight__ += 1
+        try:
+            started = threading.Event()
+            first = self.__executor__.submit(self.__attempt__, started, method, url, body, headers)
+            started.wait()
+            done, _ = wait([first], timeout=delay)
+            if done or not self.__reserve_hedge__():
+                return first.result()
+
+            logging.debug('__send__ - hedging %s after %.3fs', endpoint, delay)
+            hedge = self.__hedge_executor__.submit(self.__attempt__,
+                threading.Event(), method, url, body, headers)
+            hedge.add_done_callback(self.__release_hedge__)
+            for attempt in as_completed([first, hedge]):
+                if attempt.exception() is None:
+                    if attempt is hedge:
+                        self.__count__(hedge_wins=1)
+                    return attempt.result()
+            return first.result()
+        finally:
+            with self.__metrics_lock__:
+                self.__in_flight__ -= 1
+
+    def __attempt__(self, started, method, url, body, headers):
+        started.set()
+        return self.__session__.request(method,
+            url,
+            data=body,
+            headers=headers,
+            timeout=self.__timeout__
+        )
+
+    def __reserve_hedge__(self):
+        """Take a hedge slot if fewer than `hedge_budget` of the in-flight calls are hedged."""
+        with self.__metrics_lock__:
+            if self.__hedges_in_flight__ >= max(1, int(self.__in_flight__ * self.__hedge_budget__)):
+                return False
+            self.__hedges_in_flight__ += 1
+            self.__metrics__['hedged'] += 1
+            return True
+
+    def __release_hedge__(self, hedge):
+        with self.__metrics_lock__:
+            self.__hedges_in_flight__ -= 1
+
+    def __endpoint__(self, method, url):
+        path = url[len(self.__baseurl__):] if url.startswith(self.__baseurl__) else url
+        return f"{method} {path.split('/')[0]}"
+
+    def __breaker__(self, endpoint):
+        if self.__breaker_config__ is None:
+            return None
+        breaker = self.__breakers__.get(endpoint)
+        if breaker is None:
+            breaker = self.__breakers__.setdefault(endpoint,
+                CircuitBreaker(**self.__breaker_config__))
+        return breaker
+
+    def __latency__(self, endpoint):
+        tracker = self.__latencies__.get(endpoint)
+        if tracker is None:
+            tracker = self.__latencies__.setdefault(endpoint, LatencyTracker())
+        return tracker
+
+    def get_metrics(self):
+        """
+        Return the client's request instrumentation.
+
+        `response_bytes` counts decoded bytes of all responses. `wire_bytes` counts
+        the bytes actually transferred for responses whose transfer size is known
+        and `wire_decoded_bytes` their decoded size, so compression savings are
+        `wire_decoded_bytes - wire_bytes`. Compressed chunked responses cannot be
+        measured and are only counted in `wire_unmeasured`.
+        `endpoints` holds the p95 latency and circuit breaker state per endpoint.
+
+        Returns:
+            dict: A copy of the collected counters.
+        """
+        with self.__metrics_lock__:
+            metrics = dict(self.__metrics__)
+        latencies = dict(self.__latencies__)
+        breakers = dict(self.__breakers__)
+        metrics['endpoints'] = {
+            endpoint: {
+                'p95': latencies[endpoint].quantile(0.95) if endpoint in latencies else None,
+                'breaker': breakers[endpoint].state if endpoint in breakers else None,
+            }
+            for endpoint in set(latencies) | set(breakers)
+        }
+        return metrics
 
 ################################################################################
     # Authentication
@@ -58,7 +387,8 @@ class TimeularAPI(object):
         retrieves an access token, which is stored in the `self.__token__` attribute.
 
         If the `self.__token__` attribute is already set, this method will not attempt
-        to sign in again to avoid unnecessary API requests.
+        to sign in again to avoid unnecessary API requests. It is called lazily by
+        every authenticated request and is safe to call from several threads.
 
         Returns:
             None
@@ -82,19 +412,17 @@ class TimeularAPI(object):
         # You can now use the `timeular` object with an access token for authenticated requests.
         """
         if self.__token__ is None:
-            data = {"apiKey": self.__apikey__, "apiSecret": self.__apisecret__}
+            with self.__auth_lock__:
+                if self.__token__ is None:
+                    data = {"apiKey": self.__apikey__, "apiSecret": self.__apisecret__}
 
-            url = self.__baseurl__ + 'developer/sign-in'
+                    url = self.__baseurl__ + 'developer/sign-in'
 
-            response = request('POST',
-                url,
-                data=json.dumps(data),
-                timeout=self.__timeout__
-            ).json()
+                    response = self.__api_request__('POST', url, data)
 
-            logging.debug('sign_in - response: %s', response)
+                    logging.debug('sign_in - response: %s', response)
 
-            self.__token__ = response['token']
+                    self.__token__ = response['token']
 
     # GET Fetch API Key
     def fetch_api_key(self):
@@ -107,16 +435,11 @@ class TimeularAPI(object):
 
         logging.debug('fetch_api_key - headers: %s', headers)
 
-        response = request('GET',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('GET', url, data, headers)
 
         logging.info('fetch_api_key - response: %s', response)
 
-        return response.json()['apiKey']
+        return response['apiKey']
 
     # POST Generate new API Key & API Secret
     def generate_new_api_creds(self):
@@ -129,16 +452,11 @@ class TimeularAPI(object):
 
         logging.debug('generate_new_api_creds - headers: %s', headers)
 
-        response = request('POST',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('POST', url, data, headers)
 
         logging.info('generate_new_api_creds - response: %s', response)
 
-        return response.json()
+        return response
 
     # POST Logout
     def logout(self):
@@ -172,15 +490,11 @@ class TimeularAPI(object):
 
             logging.debug('logout - headers: %s', headers)
 
-            response = request('POST',
-                url,
-                data=json.dumps(data),
-                headers=headers,
-                timeout=self.__timeout__
-            )
+            response = self.__api_request__('POST', url, data, headers)
 
             logging.info('logout - response: %s', response)
-            self.__token__ = None
+            with self.__auth_lock__:
+                self.__token__ = None
             logging.info('logout - __token__: %s', self.__token__)
 
 ################################################################################
@@ -196,16 +510,11 @@ class TimeularAPI(object):
 
         logging.debug('get_enabled_integrations - headers: %s', headers)
 
-        response = request('GET',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('GET', url, data, headers)
 
         logging.info('get_enabled_integrations - response: %s', response)
 
-        return response.json()['integrations']
+        return response['integrations']
 
 ################################################################################
 # Time Tracking
@@ -221,16 +530,11 @@ class TimeularAPI(object):
 
         logging.debug('get_all_activities - headers: %s', headers)
 
-        response = request('GET',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('GET', url, data, headers)
 
         logging.info('get_all_activities - response: %s', response)
 
-        return response.json()
+        return response
 
 # TODO: POST Create an Activity
 # TODO: PATCH Edit an Activity
@@ -250,16 +554,11 @@ class TimeularAPI(object):
 
         logging.debug('get_all_known_devices - headers: %s', headers)
 
-        response = request('GET',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('GET', url, data, headers)
 
         logging.info('get_all_known_devices - response: %s', response)
 
-        return response.json()['devices']
+        return response['devices']
 
 # TODO: POST Activate Device
 # TODO: POST Deactivate Device
@@ -280,16 +579,11 @@ class TimeularAPI(object):
 
         logging.debug('get_current_tracking - headers: %s', headers)
 
-        response = request('GET',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('GET', url, data, headers)
 
         logging.info('get_current_tracking - response: %s', response)
 
-        return response.json()['currentTracking']
+        return response['currentTracking']
 
 # POST Start Tracking
     def start_tracking(self,
@@ -297,6 +591,7 @@ class TimeularAPI(object):
                        started_at: datetime.datetime = datetime.datetime.utcnow()
                        ):
 
+        self.__get_user_ids__()
         data = {
             'startedAt': started_at.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
         }
@@ -313,21 +608,17 @@ class TimeularAPI(object):
 
         logging.debug('start_tracking - headers: %s', headers)
 
-        response = request('POST',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('POST', url, data, headers)
 
         logging.info('start_tracking - response: {response.text}')
 
-        return response.json()
+        return response
 
 # PATCH Edit Tracking
 # POST Stop Tracking
     def stop_tracking(self, stopped_at: datetime.datetime = datetime.datetime.utcnow()):
 
+        self.__get_user_ids__()
         data = {
             'stoppedAt': stopped_at.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
         }
@@ -344,16 +635,11 @@ class TimeularAPI(object):
 
         logging.debug('stop_tracking - headers: %s', headers)
 
-        response = request('POST',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('POST', url, data, headers)
 
         logging.info('stop_tracking - response: %s', response)
 
-        return response.json()
+        return response
 
 ########################################
 ## Time Entries
@@ -379,16 +665,49 @@ class TimeularAPI(object):
 
         logging.debug('get_time_entries_in_range - headers: %s', headers)
 
-        response = request('GET',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('GET', url, data, headers)
 
         logging.info('get_time_entries_in_range - response: %s', response)
 
-        return response.json()['timeEntries']
+        return response['timeEntries']
+
+    def entries_cursor(self,
+            start: datetime.datetime,
+            step: datetime.timedelta = datetime.timedelta(days=1),
+            prefetch = 2,
+            max_windows = 16
+    ):
+        """Page through Time Entries window by window, prefetching ahead.
+
+        Args:
+            start (datetime.datetime): datetime object for the start of the first window
+            step (datetime.timedelta, optional): length of each window (default is one day)
+            prefetch (int, optional): number of windows loaded ahead (default is 2)
+            max_windows (int, optional): number of loaded windows kept (default is 16)
+
+        Returns:
+            EntriesCursor: cursor positioned on the first window
+        """
+        return EntriesCursor(self, start, step, prefetch, max_windows)
+
+    def archive_time_entries(self,
+            archive: TimeEntryArchive,
+            start: datetime.datetime,
+            end: datetime.datetime
+    ):
+        """Append the Time Entries within the given time range to a binary archive.
+
+        Args:
+            archive (TimeEntryArchive): archive the entries are appended to
+            start (datetime.datetime): datetime object for the start
+            end (datetime.datetime): datetime object for the end
+
+        Returns:
+            int: number of archived time entries
+        """
+        self.__get_user_ids__()
+        entries = self.get_time_entries_in_range(start, end)
+        return archive.append(entries, user_id=self.__user_id__)
 
 # TODO: POST Create Time Entry
 # GET Find Time Entry by its ID
@@ -410,16 +729,11 @@ class TimeularAPI(object):
 
         logging.debug('get_time_entry_by_id - headers: %s', headers)
 
-        response = request('GET',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('GET', url, data, headers)
 
         logging.info('get_time_entry_by_id - response: %s', response)
 
-        return response.json()
+        return response
 
 # TODO: PATCH Edit a Time Entry
 # TODO: DEL Delete a Time Entry
@@ -452,16 +766,11 @@ class TimeularAPI(object):
 
         logging.debug('get_all_data_as_json - headers: %s', headers)
 
-        response = request('GET',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('GET', url, data, headers)
 
         logging.info('get_all_data_as_json - response: %s', response)
 
-        return response.json()['timeEntries']
+        return response['timeEntries']
 
 ########################################
     ## Tags & Mentions
@@ -484,15 +793,10 @@ class TimeularAPI(object):
 
         logging.debug('fetch_tags_mentions - headers: %s', headers)
 
-        response = request('GET',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('GET', url, data, headers)
 
         logging.info('fetch_tags_mentions - response: %s', response)
-        return response.json()
+        return response
 
     def fetch_tags(self):
         """
@@ -542,6 +846,7 @@ class TimeularAPI(object):
             >>> timeularAPI.create_tag("Work", "timeular", "custom_space_id")
     """
         if space_id is None:
+            self.__get_user_ids__()
             space_id = self.__default_space_id__
 
         data = {
@@ -559,14 +864,9 @@ class TimeularAPI(object):
         headers = {'Authorization': f'Bearer {self.__token__}', 'Content-Type': 'application/json'}
         logging.debug('create_tag - headers: %s', headers)
 
-        response = request('POST',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('POST', url, data, headers)
         logging.info('create_tag - response: %s', response)
-        return response.json()
+        return response
 
     ### PATCH Update Tag
     def update_tag(self, tag_id: int, label):
@@ -608,14 +908,9 @@ class TimeularAPI(object):
         headers = {'Authorization': f'Bearer {self.__token__}', 'Content-Type': 'application/json'}
         logging.debug('update_tag - headers: %s', headers)
 
-        response = request('PATCH',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('PATCH', url, data, headers)
         logging.info('update_tag - response: %s', response)
-        return response.json()
+        return response
 
     ### DEL Delete Tag
     def delete_tag(self, tag_id: int):
@@ -657,14 +952,9 @@ class TimeularAPI(object):
         headers = {'Authorization': f'Bearer {self.__token__}', 'Content-Type': 'application/json'}
         logging.debug('delete_tag - headers: %s', headers)
 
-        response = request('DELETE',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('DELETE', url, data, headers)
         logging.info('delete_tag - response: %s', response)
-        return response.json()
+        return response
 
     ### POST Create Mention
     def create_mention(self, label, scope='timeular', space_id=None):
@@ -681,6 +971,7 @@ class TimeularAPI(object):
 
         """
         if space_id is None:
+            self.__get_user_ids__()
             space_id = self.__default_space_id__
 
         data = {
@@ -698,14 +989,9 @@ class TimeularAPI(object):
         headers = {'Authorization': f'Bearer {self.__token__}', 'Content-Type': 'application/json'}
         logging.debug('create_mention - headers: %s', headers)
 
-        response = request('POST',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('POST', url, data, headers)
         logging.info('create_mention - response: %s', response)
-        return response.json()
+        return response
 
     ### PATCH Update Mention
     def update_mention(self, mention_id: int, label):
@@ -732,14 +1018,9 @@ class TimeularAPI(object):
         headers = {'Authorization': f'Bearer {self.__token__}', 'Content-Type': 'application/json'}
         logging.debug('update_mention - headers: %s', headers)
 
-        response = request('PATCH',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('PATCH', url, data, headers)
         logging.info('update_mention - response: %s', response)
-        return response.json()
+        return response
 
     ### DEL Delete Mention
     def delete_mention(self, mention_id: int):
@@ -763,14 +1044,9 @@ class TimeularAPI(object):
         headers = {'Authorization': f'Bearer {self.__token__}', 'Content-Type': 'application/json'}
         logging.debug('delete_mention - headers: %s', headers)
 
-        response = request('DELETE',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('DELETE', url, data, headers)
         logging.info('delete_mention - response: %s', response)
-        return response.json()
+        return response
 
 ################################################################################
     # User Profile
@@ -794,15 +1070,10 @@ class TimeularAPI(object):
 
         logging.debug('get_user - headers: %s', headers)
 
-        response = request('GET',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('GET', url, data, headers)
 
         logging.info('get_user - response: %s', response)
-        return response.json()['data']
+        return response['data']
 
     ## Space
     ### GET Spaces with Members
@@ -824,12 +1095,28 @@ class TimeularAPI(object):
 
         logging.debug('get_spaces_with_members - headers: %s', headers)
 
-        response = request('GET',
-            url,
-            data=json.dumps(data),
-            headers=headers,
-            timeout=self.__timeout__
-        )
+        response = self.__api_request__('GET', url, data, headers)
 
         logging.info('get_spaces_with_members - response: %s', response)
-        return response.json()['data']
+        return response['data']
+
+    def collect_spaces(self,
+            start: datetime.datetime,
+            end: datetime.datetime,
+            window: datetime.timedelta = datetime.timedelta(days=7),
+            max_workers = 8
+    ):
+        """
+        Collect tags, mentions and time entries of all spaces concurrently.
+
+        Args:
+            start (datetime.datetime): datetime object for the start
+            end (datetime.datetime): datetime object for the end
+            window (datetime.timedelta, optional): length of each time entry request
+            max_workers (int, optional): number of concurrent requests
+
+        Returns:
+            dict: data partitioned by space ID and member ID, see `collector.collect_spaces`.
+
+        """
+        return collect_spaces(self, start, end, window, max_workers)
@@ -0,0 +1,325 @@
+
+import datetime
+import json
+import logging
+import mmap
+import os
+import struct
+
+from .codec import get_codec
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+RECORD = struct.Struct('<7q')
+FIELDS = ('id', 'activity_id', 'started_at', 'stopped_at', 'user_id', 'side_offset', 'side_length')
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def to_epoch_ms(value: str):
+    """Convert a Timeular timestamp ('2024-01-01T10:00:00.000', UTC) to epoch milliseconds."""
+    return (datetime.datetime.strptime(value, TIME_FORMAT) - EPOCH) // datetime.timedelta(milliseconds=1)
+
+
+def from_epoch_ms(value: int):
+    """Convert epoch milliseconds to a Timeular timestamp."""
+    return (EPOCH + datetime.timedelta(milliseconds=value)).strftime(TIME_FORMAT)[:-3]
+
+
+def month_of(epoch_ms: int):
+    """Return the month number (year * 12 + month - 1) of an epoch millisecond timestamp."""
+    moment = EPOCH + datetime.timedelta(milliseconds=epoch_ms)
+    return moment.year * 12 + moment.month - 1
+
+
+class TimeEntryArchive(object):
+    """
+    Append-only binary archive of time entries with memory-mapped reads.
+
+    The archive is a directory containing:
+    - `entries.bin`: fixed-width little-endian int64 records of `FIELDS`
+    - `side.bin`: JSON encoded note, tags and mentions, addressed by the
+      `side_offset`/`side_length` of each record
+    - `index.json`: sparse month index mapping each month to the runs of
+      records starting in it, as [first, last + 1) pairs, so range scans only
+      touch those pages even when ranges are appended out of order
+
+    Records are not deduplicated; append each range only once.
+
+    Args:
+        path (str): Directory of the archive; created if missing.
+        codec (str | object, optional): JSON codec for the side table, see `codec.get_codec`.
+
+    Example:
+        with TimeEntryArchive('history') as archive:
+            timeular.archive_time_entries(archive, start, end)
+            started_at = archive.as_numpy(start, end)['started_at']
+    """
+
+    def __init__(self, path, codec=None):
+        self.__path__ = path
+        self.__codec__ = get_codec(codec)
+        os.makedirs(path, exist_ok=True)
+        self.__entries_path__ = os.path.join(path, 'entries.bin')
+        self.__side_path__ = os.path.join(path, 'side.bin')
+        self.__index_path__ = os.path.join(path, 'index.json')
+        for file_path in (self.__entries_path__, self.__side_path__):
+            open(file_path, 'ab').close()
+        try:
+            with open(self.__index_path__, 'r', encoding='utf-8') as handle:
+                self.__index__ = {int(month): runs for month, runs in json.load(handle).items()}
+        except FileNotFoundError:
+            self.__index__ = {}
+        self.__entries_map__ = None
+        self.__side_map__ = None
+        self.__recover__()
+        self.__remap__()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self.__entries_map__) // RECORD.size if self.__entries_map__ is not None else 0
+
+    def close(self):
+        """
+        Release the memory maps.
+
+        Maps still exported to NumPy views from `as_numpy` are left to be released
+        by the garbage collector once the last view is gone.
+        """
+        for memory_map in (self.__entries_map__, self.__side_map__):
+            if memory_map is not None:
+                try:
+                    memory_map.close()
+                except BufferError:
+                    pass
+        self.__entries_map__ = None
+        self.__side_map__ = None
+
+    def append(self, entries, user_id=0):
+        """
+        Append time entries as returned by `get_time_entries_in_range`.
+
+        Entries are sorted by start before writing so the month index stays tight.
+
+        Args:
+            entries (list): Time entries to append.
+            user_id (int, optional): User ID stored for entries without a `userId`.
+
+        Returns:
+            int: Number of records written.
+        """
+        entries = sorted(entries, key=lambda entry: entry['duration']['startedAt'])
+        first = len(self)
+        records = bytearray()
+        side = bytearray()
+        side_offset = os.path.getsize(self.__side_path__)
+
+        for position, entry in enumerate(entries, start=first):
+            note = entry.get('note') or {}
+            blob = self.__codec__.dumps({
+                'text': note.get('text'),
+                'tags': note.get('tags', []),
+                'mentions': note.get('mentions', []),
+            })
+            started_at = to_epoch_ms(entry['duration']['startedAt'])
+            records += RECORD.pack(
+                int(entry['id']),
+                int(entry['activityId']),
+                started_at,
+                to_epoch_ms(entry['duration']['stoppedAt']),
+                int(entry.get('userId', user_id)),
+                side_offset + len(side),
+                len(blob),
+            )
+            side += blob
+
+            self.__index_record__(position, started_at)
+
+        with open(self.__side_path__, 'ab') as handle:
+            handle.write(side)
+        with open(self.__entries_path__, 'ab') as handle:
+            handle.write(records)
+
+        self.__write_index__()
+        self.__remap__()
+        return len(entries)
+
+    def record(self, position):
+        """
+        Return the fixed-width record at `position`.
+
+        Returns:
+            tuple: Values in the order of `FIELDS`.
+        """
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return RECORD.unpack_from(self.__entries_map__, position * RECORD.size)
+
+    def side(self, position):
+        """
+        Return the note, tags and mentions of the record at `position`.
+
+        Returns:
+            dict: With the keys 'text', 'tags' and 'mentions'.
+        """
+        offset, length = self.record(position)[5:]
+        return self.__codec__.loads(self.__side_map__[offset:offset + length])
+
+    def positions(self, start: datetime.datetime = None, end: datetime.datetime = None):
+        """
+        Return the record runs of the months overlapping [start, end).
+
+        Runs only contain records starting in those months, but may include
+        records outside [start, end) within the first and last month, which
+        callers filter by `started_at`.
+
+        Returns:
+            list: Sorted, non-overlapping (first, last + 1) record positions.
+        """
+        if start is None and end is None:
+            return [(0, len(self))] if len(self) else []
+
+        first_month = month_of(self.__to_ms__(start)) if start is not None else None
+        last_month = month_of(self.__to_ms__(end)) if end is not None else None
+        runs = sorted(
+            tuple(run) for month, month_runs in self.__index__.items()
+            if (first_month is None or month >= first_month)
+            and (last_month is None or month <= last_month)
+            for run in month_runs
+        )
+
+        merged = []
+        for first, last in runs:
+            if merged and merged[-1][1] == first:
+                merged[-1] = (merged[-1][0], last)
+            else:
+                merged.append((first, last))
+        return merged
+
+    def records(self, start: datetime.datetime = None, end: datetime.datetime = None):
+        """
+        Iterate over the records of entries starting in [start, end).
+
+        Yields:
+            tuple: Values in the order of `FIELDS`.
+        """
+        start_ms = self.__to_ms__(start) if start is not None else None
+        end_ms = self.__to_ms__(end) if end is not None else None
+        for first, last in self.positions(start, end):
+            for values in RECORD.iter_unpack(self.__entries_map__[first * RECORD.size:last * RECORD.size]):
+                if (start_ms is None or values[2] >= start_ms) and (end_ms is None or values[2] < end_ms):
+                    yield values
+
+    def entries(self, start: datetime.datetime = None, end: datetime.datetime = None):
+        """
+        Rebuild time entries in the shape returned by the API.
+
+        Returns:
+            list: Time entries starting in [start, end).
+        """
+        result = []
+        for values in self.records(start, end):
+            record = dict(zip(FIELDS, values))
+            side = self.__codec__.loads(
+                self.__side_map__[record['side_offset']:record['side_offset'] + record['side_length']])
+            result.append({
+                'id': str(record['id']),
+                'activityId': str(record['activity_id']),
+                'userId': str(record['user_id']),
+                'duration': {
+                    'startedAt': from_epoch_ms(record['started_at']),
+                    'stoppedAt': from_epoch_ms(record['stopped_at']),
+                },
+                'note': side,
+            })
+        return result
+
+    def as_numpy(self, start: datetime.datetime = None, end: datetime.datetime = None):
+        """
+        Return a structured NumPy view of the records of the months overlapping [start, end).
+
+        The records come from the runs selected by the month index; filter on the
+        `started_at` column for an exact range. A single run is returned as a
+        zero-copy view of the memory map, which stays valid across `append` and
+        `close`; several runs are concatenated into a copy.
+
+        Returns:
+            numpy.ndarray: Structured array with one int64 field per entry of `FIELDS`.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if numpy is None:
+            raise ImportError('as_numpy requires numpy')
+        dtype = numpy.dtype([(field, '<i8') for field in FIELDS])
+        views = [
+            numpy.frombuffer(self.__entries_map__, dtype=dtype, count=last - first, offset=first * RECORD.size)
+            for first, last in self.positions(start, end)
+        ]
+        if not views:
+            return numpy.empty(0, dtype=dtype)
+        return views[0] if len(views) == 1 else numpy.concatenate(views)
+
+    def __index_record__(self, position, started_at):
+        runs = self.__index__.setdefault(month_of(started_at), [])
+        if runs and runs[-1][1] == position:
+            runs[-1][1] = position + 1
+        else:
+            runs.append([position, position + 1])
+
+    def __write_index__(self):
+        temp_path = self.__index_path__ + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            json.dump(self.__index__, handle)
+        os.replace(temp_path, self.__index_path__)
+
+    def __recover__(self):
+        """
+        Repair an archive left behind by an interrupted `append`.
+
+        A trailing partial record is truncated, and records written after the
+        last index update are indexed from their `started_at`. Side data without
+        records is unreferenced and harmless.
+        """
+        size = os.path.getsize(self.__entries_path__)
+        if size % RECORD.size:
+            logging.warning('TimeEntryArchive - truncating partial record in %s', self.__entries_path__)
+            with open(self.__entries_path__, 'r+b') as handle:
+                handle.truncate(size - size % RECORD.size)
+
+        indexed = max((run[1] for runs in self.__index__.values() for run in runs), default=0)
+        count = os.path.getsize(self.__entries_path__) // RECORD.size
+        if count <= indexed:
+            return
+
+        logging.warning('TimeEntryArchive - indexing %d unindexed records', count - indexed)
+        with open(self.__entries_path__, 'rb') as handle:
+            handle.seek(indexed * RECORD.size)
+            data = handle.read()
+        for position, values in enumerate(RECORD.iter_unpack(data), start=indexed):
+            self.__index_record__(position, values[2])
+        self.__write_index__()
+
+    def __remap__(self):
+        self.close()
+        if os.path.getsize(self.__entries_path__) > 0:
+            with open(self.__entries_path__, 'rb') as handle:
+                self.__entries_map__ = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if os.path.getsize(self.__side_path__) > 0:
+            with open(self.__side_path__, 'rb') as handle:
+                self.__side_map__ = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def __to_ms__(moment: datetime.datetime):
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return (moment - EPOCH) // datetime.timedelta(milliseconds=1)
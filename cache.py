@@ -0,0 +1,142 @@
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from collections import OrderedDict
+
+
+class CacheEntry(object):
+    """Validators and body of a cached GET response."""
+
+    def __init__(self, content: bytes, etag=None, last_modified=None, parsed=None):
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.parsed = parsed
+
+    def validators(self):
+        """
+        Build the conditional request headers for this entry.
+
+        Returns:
+            dict: `If-None-Match` and/or `If-Modified-Since` headers.
+        """
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class MemoryCache(object):
+    """
+    In-memory HTTP response cache keeping the parsed body of each entry.
+
+    Args:
+        max_entries (int, optional): Number of entries kept before the least
+            recently used one is evicted (default is 256).
+    """
+
+    def __init__(self, max_entries=256):
+        self.__max_entries__ = max_entries
+        self.__entries__ = OrderedDict()
+        self.__lock__ = threading.Lock()
+
+    def get(self, key):
+        with self.__lock__:
+            entry = self.__entries__.get(key)
+            if entry is not None:
+                self.__entries__.move_to_end(key)
+            return entry
+
+    def set(self, key, entry: CacheEntry):
+        with self.__lock__:
+            self.__entries__[key] = entry
+            self.__entries__.move_to_end(key)
+            while len(self.__entries__) > self.__max_entries__:
+                self.__entries__.popitem(last=False)
+
+    def clear(self):
+        with self.__lock__:
+            self.__entries__.clear()
+
+
+class DiskCache(MemoryCache):
+    """
+    HTTP response cache persisted to a directory, so validators survive restarts.
+
+    Each entry is stored as `<key>.json` (validators) and `<key>.body` (raw
+    response). Entries read from disk are kept in memory once parsed.
+
+    Args:
+        path (str): Directory holding the cache files; created if missing.
+        max_entries (int, optional): Number of entries kept in memory.
+    """
+
+    def __init__(self, path, max_entries=256):
+        super().__init__(max_entries)
+        self.__path__ = path
+        os.makedirs(path, exist_ok=True)
+
+    def __path_for__(self, key, suffix):
+        return os.path.join(self.__path__, f'{key}.{suffix}')
+
+    def get(self, key):
+        entry = super().get(key)
+        if entry is not None:
+            return entry
+
+        try:
+            with open(self.__path_for__(key, 'json'), 'r', encoding='utf-8') as handle:
+                validators = json.load(handle)
+            with open(self.__path_for__(key, 'body'), 'rb') as handle:
+                content = handle.read()
+        except (OSError, ValueError):
+            return None
+
+        entry = CacheEntry(content, validators.get('etag'), validators.get('last_modified'))
+        super().set(key, entry)
+        return entry
+
+    def set(self, key, entry: CacheEntry):
+        super().set(key, entry)
+        validators = {'etag': entry.etag, 'last_modified': entry.last_modified}
+        try:
+            self.__write__(self.__path_for__(key, 'body'), entry.content)
+            self.__write__(self.__path_for__(key, 'json'), json.dumps(validators).encode('utf-8'))
+        except OSError as error:
+            logging.warning('DiskCache.set - failed to write %s: %s', key, error)
+
+    def clear(self):
+        super().clear()
+        for name in os.listdir(self.__path__):
+            if name.endswith(('.json', '.body')):
+                os.remove(os.path.join(self.__path__, name))
+
+    @staticmethod
+    def __write__(path, data: bytes):
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'wb') as handle:
+            handle.write(data)
+        os.replace(temp_path, path)
+
+
+def cache_key(api_key, url):
+    """
+    Derive the cache key for a GET request.
+
+    The API key is part of the key so a shared cache never serves one account's
+    responses to another.
+
+    Args:
+        api_key (str): The API key of the client.
+        url (str): Full URL of the request.
+
+    Returns:
+        str: Hex digest usable as a file name.
+    """
+    return hashlib.sha256(f'{api_key}\n{url}'.encode('utf-8')).hexdigest()
@@ -0,0 +1,109 @@
+
+import json
+import logging
+
+
+class StdlibCodec(object):
+    """JSON codec backed by the standard library `json` module."""
+
+    name = 'json'
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data: bytes):
+        return json.loads(data)
+
+
+class OrjsonCodec(object):
+    """JSON codec backed by `orjson`, if it is installed."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self.__orjson__ = orjson
+
+    def dumps(self, obj) -> bytes:
+        return self.__orjson__.dumps(obj)
+
+    def loads(self, data: bytes):
+        return self.__orjson__.loads(data)
+
+
+class MsgspecCodec(object):
+    """JSON codec backed by `msgspec`, if it is installed."""
+
+    name = 'msgspec'
+
+    def __init__(self):
+        import msgspec
+        self.__encoder__ = msgspec.json.Encoder()
+        self.__decoder__ = msgspec.json.Decoder()
+
+    def dumps(self, obj) -> bytes:
+        return self.__encoder__.encode(obj)
+
+    def loads(self, data: bytes):
+        return self.__decoder__.decode(data)
+
+
+CODECS = {
+    'orjson': OrjsonCodec,
+    'msgspec': MsgspecCodec,
+    'json': StdlibCodec,
+}
+
+
+def get_codec(codec=None):
+    """
+    Resolve the JSON codec used to encode request bodies and decode responses.
+
+    Args:
+        codec (str | object, optional): One of 'json', 'orjson' or 'msgspec', or any
+            object providing `dumps(obj) -> bytes` and `loads(bytes)`. If not provided,
+            the fastest installed backend is used, falling back to the stdlib.
+
+    Returns:
+        object: The codec instance.
+
+    Raises:
+        ValueError: If the codec name is unknown.
+        ImportError: If the named backend is not installed.
+    """
+    if codec is None:
+        for name, codec_class in CODECS.items():
+            try:
+                selected = codec_class()
+            except ImportError:
+                continue
+            logging.debug('get_codec - selected: %s', name)
+            return selected
+
+    if isinstance(codec, str):
+        if codec not in CODECS:
+            raise ValueError(f'unknown JSON codec: {codec}')
+        return CODECS[codec]()
+
+    return codec
+
+
+def accept_encoding():
+    """
+    Build the `Accept-Encoding` header value for the decoders available locally.
+
+    gzip and deflate are always decoded by urllib3; brotli only when `brotli` or
+    `brotlicffi` is installed.
+
+    Returns:
+        str: The header value, e.g. 'br, gzip, deflate'.
+    """
+    encodings = ['gzip', 'deflate']
+    for module in ('brotli', 'brotlicffi'):
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        encodings.insert(0, 'br')
+        break
+    return ', '.join(encodings)
@@ -0,0 +1,104 @@
+
+import datetime
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+UNASSIGNED = 'unassigned'
+ACTIVITY_LISTS = ('activities', 'inactiveActivities', 'archivedActivities')
+
+
+def collect_spaces(api, start: datetime.datetime, end: datetime.datetime,
+        window: datetime.timedelta = datetime.timedelta(days=7),
+        max_workers = 8
+):
+    """
+    Collect spaces, members, tags, mentions and time entries concurrently.
+
+    Spaces, activities, tags & mentions and the time entries (split into
+    `window` sized ranges) are requested in parallel, then partitioned by space
+    and member. Time entries are assigned to the space of their activity, including
+    inactive and archived activities, and to the member in their `userId` field, or
+    to the signed-in user if it is missing. Entries whose space cannot be resolved
+    are collected under the `UNASSIGNED` key.
+
+    Each window returns every entry overlapping it, so an entry crossing a window
+    boundary is returned more than once; entries are deduplicated by ID.
+
+    Args:
+        api (TimeularAPI): Signed-in client used for the requests.
+        start (datetime.datetime): datetime object for the start
+        end (datetime.datetime): datetime object for the end
+        window (datetime.timedelta, optional): Length of each time entry request
+            (default is seven days).
+        max_workers (int, optional): Number of concurrent requests (default is 8).
+
+    Returns:
+        dict: Mapping of space ID to a dict with the keys 'space', 'tags',
+        'mentions', 'timeEntries' and 'members', the latter mapping member ID
+        to a dict with 'member' and 'timeEntries'. The `UNASSIGNED` entry has the
+        same shape with 'space' set to None.
+    """
+    ranges = []
+    window_start = start
+    while window_start < end:
+        window_end = min(window_start + window, end)
+        ranges.append((window_start, window_end))
+        window_start = window_end
+
+    api.__get_user_ids__()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        spaces = executor.submit(api.get_spaces_with_members)
+        activities = executor.submit(api.get_all_activities)
+        tags_mentions = executor.submit(api.fetch_tags_mentions)
+        entries = [executor.submit(api.get_time_entries_in_range, s, e) for s, e in ranges]
+
+        spaces = spaces.result()
+        activities = activities.result()
+        tags_mentions = tags_mentions.result()
+        entries = list({
+            str(entry['id']): entry for future in entries for entry in future.result()
+        }.values())
+
+    result = {}
+    for space in spaces:
+        result[str(space['id'])] = {
+            'space': space,
+            'tags': [],
+            'mentions': [],
+            'timeEntries': [],
+            'members': {
+                str(member['id']): {'member': member, 'timeEntries': []}
+                for member in space.get('members', [])
+            },
+        }
+    result[UNASSIGNED] = {
+        'space': None,
+        'tags': [],
+        'mentions': [],
+        'timeEntries': [],
+        'members': {},
+    }
+
+    for kind in ('tags', 'mentions'):
+        for item in tags_mentions.get(kind, []):
+            space = result.get(str(item.get('spaceId')), result[UNASSIGNED])
+            space[kind].append(item)
+
+    activity_spaces = {
+        str(activity['id']): str(activity.get('spaceId'))
+        for activity_list in ACTIVITY_LISTS
+        for activity in activities.get(activity_list, [])
+    }
+    for entry in entries:
+        space = result.get(activity_spaces.get(str(entry.get('activityId'))))
+        if space is None:
+            logging.debug('collect_spaces - no space for entry: %s', entry.get('id'))
+            space = result[UNASSIGNED]
+        space['timeEntries'].append(entry)
+        member = space['members'].get(str(entry.get('userId', api.__user_id__)))
+        if member is not None:
+            member['timeEntries'].append(entry)
+
+    return result
@@ -0,0 +1,157 @@
+
+import datetime
+import logging
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class EntriesCursor(object):
+    """
+    Cursor over consecutive time-entry windows with background readahead.
+
+    The current window and the next `prefetch` windows are requested in the
+    background; loaded windows are kept in a bounded LRU so stepping back is
+    served from memory. Jumping elsewhere cancels prefetches that have not
+    started yet. The current window is loaded on its own executor, so it never
+    waits behind prefetches of windows the user jumped away from.
+
+    Args:
+        api (TimeularAPI): Client used to fetch the windows.
+        start (datetime.datetime): Start of the first window.
+        step (datetime.timedelta, optional): Window length (default is one day).
+        prefetch (int, optional): Number of windows fetched ahead (default is 2).
+        max_windows (int, optional): Number of windows kept in memory (default is 16).
+
+    Example:
+        with TimeularAPI(key, secret, 'Europe/Vienna') as timeular:
+            cursor = timeular.entries_cursor(datetime.datetime(2024, 1, 1))
+            today = cursor.entries()
+            tomorrow = cursor.next()
+    """
+
+    def __init__(self, api, start: datetime.datetime,
+            step: datetime.timedelta = datetime.timedelta(days=1),
+            prefetch = 2,
+            max_windows = 16
+    ):
+        if step <= datetime.timedelta(0):
+            raise ValueError('step must be positive')
+
+        self.__api__ = api
+        self.__start__ = start
+        self.__step__ = step
+        self.__prefetch__ = prefetch
+        self.__max_windows__ = max(max_windows, prefetch + 1)
+        self.__windows__ = OrderedDict()
+        self.__lock__ = threading.Lock()
+        self.__executor__ = ThreadPoolExecutor(max_workers=max(1, prefetch))
+        self.__current_executor__ = ThreadPoolExecutor(max_workers=self.__max_windows__)
+        self.__schedule__()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            yield self.__start__, self.entries()
+            self.next()
+
+    @property
+    def start(self):
+        """datetime.datetime: Start of the current window."""
+        return self.__start__
+
+    @property
+    def end(self):
+        """datetime.datetime: End of the current window."""
+        return self.__start__ + self.__step__
+
+    def entries(self):
+        """
+        Return the time entries of the current window, waiting if it is still loading.
+
+        Returns:
+            list: The time entries in the current window.
+        """
+        future = self.__schedule__()
+        return future.result()
+
+    def next(self):
+        """
+        Move to the following window.
+
+        Returns:
+            list: The time entries in the new current window.
+        """
+        return self.jump(self.__start__ + self.__step__)
+
+    def previous(self):
+        """
+        Move to the preceding window.
+
+        Returns:
+            list: The time entries in the new current window.
+        """
+        return self.jump(self.__start__ - self.__step__)
+
+    def jump(self, start: datetime.datetime):
+        """
+        Move to the window starting at `start`.
+
+        Prefetches outside the new readahead range that have not started are cancelled.
+
+        Args:
+            start (datetime.datetime): Start of the new current window.
+
+        Returns:
+            list: The time entries in the new current window.
+        """
+        self.__start__ = start
+        wanted = set(self.__readahead__())
+        with self.__lock__:
+            for window, future in list(self.__windows__.items()):
+                if window not in wanted and not future.done() and future.cancel():
+                    logging.debug('EntriesCursor.jump - cancelled prefetch: %s', window)
+                    del self.__windows__[window]
+        return self.entries()
+
+    def close(self):
+        """Cancel pending prefetches and release the worker threads."""
+        with self.__lock__:
+            for future in self.__windows__.values():
+                future.cancel()
+            self.__windows__.clear()
+        self.__executor__.shutdown(wait=False)
+        self.__current_executor__.shutdown(wait=False)
+
+    def __readahead__(self):
+        return [self.__start__ + self.__step__ * i for i in range(self.__prefetch__ + 1)]
+
+    def __schedule__(self):
+        """Make sure the current window and its readahead are loaded or loading."""
+        with self.__lock__:
+            for window in self.__readahead__():
+                future = self.__windows__.get(window)
+                current = window == self.__start__
+                if current and future is not None and not future.running() and not future.done():
+                    # still queued behind prefetches, move it to the current window's slot
+                    future.cancel()
+                if future is None or future.cancelled() \
+                        or (future.done() and future.exception() is not None):
+                    executor = self.__current_executor__ if current else self.__executor__
+                    future = executor.submit(
+                        self.__api__.get_time_entries_in_range, window, window + self.__step__)
+                    self.__windows__[window] = future
+                self.__windows__.move_to_end(window)
+
+            current = self.__windows__[self.__start__]
+            self.__windows__.move_to_end(self.__start__)
+            while len(self.__windows__) > self.__max_windows__:
+                _, evicted = self.__windows__.popitem(last=False)
+                evicted.cancel()
+            return current
@@ -0,0 +1,445 @@
+"""
+Load and scaling harness for TimeularAPI.
+
+Runs weighted mixes of client calls from threads, processes or asyncio tasks
+against a local stand-in server with injected latency, 429s and 5xx errors,
+and appends throughput, latency percentiles, CPU time and peak RSS per
+scenario to a JSON lines file so results can be compared between releases.
+
+The client is synchronous: `asyncio` mode runs its calls in a thread pool via
+`run_in_executor`, it is not a native async client. Peak RSS is sampled from
+`/proc/self/status` while each scenario runs, so it is comparable between
+scenarios of one run; it is None where `/proc` is not available.
+
+Example:
+    python -m timeularv3.loadtest --mode threads --concurrency 1 8 32 \\
+        --mix get_current_tracking=9 get_time_entries_in_range=1 \\
+        --latency 0.05 --rate-limit 0.01 --label 1.2.0 --output results.jsonl
+    python -m timeularv3.loadtest --compare 1.1.0 1.2.0 --output results.jsonl
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import multiprocessing
+import random
+import resource
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from . import TimeularAPI
+
+
+ENTRIES_START = datetime.datetime(2024, 1, 1)
+ENTRIES_END = datetime.datetime(2024, 1, 8)
+
+CALLS = {
+    'get_current_tracking': lambda api: api.get_current_tracking(),
+    'get_user': lambda api: api.get_user(),
+    'get_all_activities': lambda api: api.get_all_activities(),
+    'fetch_tags_mentions': lambda api: api.fetch_tags_mentions(),
+    'get_time_entries_in_range': lambda api: api.get_time_entries_in_range(ENTRIES_START, ENTRIES_END),
+}
+
+
+def time_entries(count):
+    """Build `count` synthetic time entries in the shape returned by the API."""
+    return [
+        {
+            'id': str(i),
+            'activityId': str(i % 7),
+            'duration': {
+                'startedAt': '2024-01-01T09:00:00.000',
+                'stoppedAt': '2024-01-01T10:00:00.000',
+            },
+            'note': {'text': f'entry {i}', 'tags': [], 'mentions': []},
+        }
+        for i in range(count)
+    ]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves canned Timeular API responses with injected latency and failures."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    wbufsize = 64 * 1024
+
+    def log_message(self, format, *args):
+        pass
+
+    def __respond__(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        config = self.server.config
+        time.sleep(max(0.0, random.gauss(config['latency'], config['jitter'])))
+
+        path = self.path.split('/api/v3/', 1)[-1]
+        roll = random.random()
+        if path != 'developer/sign-in' and roll < config['rate_limit']:
+            return self.__send__(429, {'message': 'Too Many Requests'})
+        if path != 'developer/sign-in' and roll < config['rate_limit'] + config['error_rate']:
+            return self.__send__(500, {'message': 'Internal Server Error'})
+
+        if path == 'developer/sign-in':
+            body = {'token': 'stand-in-token'}
+        elif path == 'me':
+            body = {'data': {'userId': '1', 'defaultSpaceId': '1'}}
+        elif path == 'tracking':
+            body = {'currentTracking': None}
+        elif path == 'activities':
+            body = {'activities': [{'id': str(i), 'spaceId': '1'} for i in range(7)]}
+        elif path == 'tags-and-mentions':
+            body = {'tags': [], 'mentions': []}
+        elif path.startswith('time-entries/'):
+            body = {'timeEntries': self.server.entries}
+        else:
+            body = {}
+        self.__send__(200, body)
+
+    def __send__(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = __respond__
+
+
+def serve(config, ports):
+    """Run the stand-in server; the bound port is reported through `ports`."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    server.config = config
+    server.entries = time_entries(config['entries'])
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+class StandInServer(object):
+    """
+    Local stand-in for the Timeular API running in its own process, so its CPU
+    time does not count towards the client's.
+
+    Args:
+        latency (float, optional): Mean response latency in seconds.
+        jitter (float, optional): Standard deviation of the latency in seconds.
+        rate_limit (float, optional): Fraction of calls answered with 429.
+        error_rate (float, optional): Fraction of calls answered with 500.
+        entries (int, optional): Number of time entries per range response.
+    """
+
+    def __init__(self, latency=0.02, jitter=0.005, rate_limit=0.0, error_rate=0.0, entries=200):
+        self.config = {
+            'latency': latency,
+            'jitter': jitter,
+            'rate_limit': rate_limit,
+            'error_rate': error_rate,
+            'entries': entries,
+        }
+        self.__process__ = None
+        self.url = None
+
+    def __enter__(self):
+        ports = multiprocessing.Queue()
+        self.__process__ = multiprocessing.Process(target=serve, args=(self.config, ports), daemon=True)
+        self.__process__.start()
+        self.url = f'http://127.0.0.1:{ports.get(timeout=10)}/api/v3/'
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.__process__.terminate()
+        self.__process__.join()
+
+
+def current_rss_kib():
+    """Return the current resident set size in KiB, or None without `/proc`."""
+    try:
+        with open('/proc/self/status', 'r', encoding='ascii') as handle:
+            for line in handle:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+class RssSampler(object):
+    """Samples the current RSS in a background thread and keeps the peak."""
+
+    def __init__(self, interval=0.05):
+        self.__interval__ = interval
+        self.__stop__ = threading.Event()
+        self.__thread__ = threading.Thread(target=self.__run__, daemon=True)
+        self.peak = current_rss_kib()
+
+    def __enter__(self):
+        self.__thread__.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.__stop__.set()
+        self.__thread__.join()
+        self.__sample__()
+
+    def __run__(self):
+        while not self.__stop__.wait(self.__interval__):
+            self.__sample__()
+
+    def __sample__(self):
+        rss = current_rss_kib()
+        if rss is not None:
+            self.peak = max(self.peak or 0, rss)
+
+
+def make_client(url, concurrency):
+    """Build a client for the stand-in server; use it as a context manager so its
+    session is signed in up front and closed with the scenario."""
+    api = TimeularAPI('load', 'test', 'UTC', pool_size=max(10, concurrency))
+    api.__baseurl__ = url
+    return api
+
+
+def run_calls(api, mix, deadline, seed):
+    """
+    Issue calls drawn from `mix` until `deadline`.
+
+    Returns:
+        tuple: (latencies of successful calls, number of failed calls)
+    """
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies = []
+    errors = 0
+    while time.monotonic() < deadline:
+        call = CALLS[rng.choices(names, weights)[0]]
+        started = time.perf_counter()
+        try:
+            call(api)
+        except Exception:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    return latencies, errors
+
+
+def process_worker(url, mix, duration, seed):
+    with RssSampler() as sampler, make_client(url, 1) as api:
+        latencies, errors = run_calls(api, mix, time.monotonic() + duration, seed)
+    return latencies, errors, sampler.peak
+
+
+def run_threads(url, mix, concurrency, duration):
+    with make_client(url, concurrency) as api:
+        deadline = time.monotonic() + duration
+        results = [None] * concurrency
+
+        def worker(index):
+            results[index] = run_calls(api, mix, deadline, index) + (None,)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+
+def run_processes(url, mix, concurrency, duration):
+    with multiprocessing.Pool(concurrency) as pool:
+        return pool.starmap(process_worker, [(url, mix, duration, i) for i in range(concurrency)])
+
+
+def run_asyncio(url, mix, concurrency, duration):
+    async def main(api):
+        deadline = time.monotonic() + duration
+        loop = asyncio.get_running_loop()
+
+        async def task(index):
+            rng = random.Random(index)
+            names = list(mix)
+            weights = [mix[name] for name in names]
+            latencies = []
+            errors = 0
+            while time.monotonic() < deadline:
+                call = CALLS[rng.choices(names, weights)[0]]
+                started = time.perf_counter()
+                try:
+                    await loop.run_in_executor(None, call, api)
+                except Exception:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+            return latencies, errors, None
+
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+        return await asyncio.gather(*(task(i) for i in range(concurrency)))
+
+    with make_client(url, concurrency) as api:
+        return asyncio.run(main(api))
+
+
+MODES = {
+    'threads': run_threads,
+    'processes': run_processes,
+    'asyncio': run_asyncio,
+}
+
+
+def percentile(samples, q):
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def run_scenario(server, mode, mix, concurrency, duration):
+    """
+    Run one scenario against a started `StandInServer`.
+
+    Args:
+        server (StandInServer): Started stand-in server.
+        mode (str): One of 'threads', 'processes' or 'asyncio'.
+        mix (dict): Mapping of call name (see `CALLS`) to weight.
+        concurrency (int): Number of concurrent simulated users.
+        duration (float): Seconds to run.
+
+    Each mode returns one (latencies, errors, peak RSS) tuple per simulated
+    user; the RSS is only set by the `processes` workers.
+
+    Returns:
+        dict: Throughput, latency percentiles in ms, error count, CPU seconds,
+        peak RSS in KiB of this process sampled during the scenario and, in
+        `processes` mode, the highest peak RSS of a worker process.
+    """
+    before = resource.getrusage(resource.RUSAGE_SELF)
+    before_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    started = time.perf_counter()
+
+    with RssSampler() as sampler:
+        results = MODES[mode](server.url, mix, concurrency, duration)
+
+    elapsed = time.perf_counter() - started
+    after = resource.getrusage(resource.RUSAGE_SELF)
+    after_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    latencies = sorted(latency for result, _, _ in results for latency in result)
+    errors = sum(result_errors for _, result_errors, _ in results)
+    worker_rss = [rss for _, _, rss in results if rss is not None]
+    cpu = (after.ru_utime + after.ru_stime - before.ru_utime - before.ru_stime)
+    if mode == 'processes':
+        cpu += (after_children.ru_utime + after_children.ru_stime
+                - before_children.ru_utime - before_children.ru_stime)
+
+    return {
+        'mode': mode,
+        'mix': mix,
+        'concurrency': concurrency,
+        'duration': round(elapsed, 3),
+        'calls': len(latencies),
+        'errors': errors,
+        'throughput': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        'cpu_seconds': round(cpu, 3),
+        'max_rss_kib': sampler.peak,
+        'worker_max_rss_kib': max(worker_rss) if worker_rss else None,
+    }
+
+
+def compare(results, baseline_label, label):
+    """
+    Compare the scenarios of two runs.
+
+    Args:
+        results (list): Result records read from the output file.
+        baseline_label (str): Label of the baseline run.
+        label (str): Label of the run to compare.
+
+    Returns:
+        list: One dict per scenario present in both runs with the relative change
+        of throughput and p95 latency.
+    """
+    def scenarios(run_label):
+        return {
+            (record['mode'], json.dumps(record['mix'], sort_keys=True), record['concurrency']): record
+            for record in results if record['label'] == run_label
+        }
+
+    baseline = scenarios(baseline_label)
+    comparison = []
+    for key, record in scenarios(label).items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        comparison.append({
+            'mode': key[0],
+            'mix': record['mix'],
+            'concurrency': key[2],
+            'throughput_change': round(record['throughput'] / base['throughput'] - 1, 3)
+                if base['throughput'] else None,
+            'p95_change': round(record['p95_ms'] / base['p95_ms'] - 1, 3)
+                if base['p95_ms'] and record['p95_ms'] else None,
+        })
+    return comparison
+
+
+def parse_mix(values):
+    mix = {}
+    for value in values:
+        name, _, weight = value.partition('=')
+        if name not in CALLS:
+            raise argparse.ArgumentTypeError(f'unknown call: {name}')
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test TimeularAPI against a local stand-in server.')
+    parser.add_argument('--mode', nargs='+', choices=sorted(MODES), default=['threads'])
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 8, 32])
+    parser.add_argument('--mix', nargs='+', default=['get_current_tracking'],
+                        help='call=weight pairs, calls: ' + ', '.join(CALLS))
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--jitter', type=float, default=0.005)
+    parser.add_argument('--rate-limit', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--entries', type=int, default=200)
+    parser.add_argument('--label', default=datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S'))
+    parser.add_argument('--output', default='loadtest.jsonl')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'LABEL'))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.output, 'r', encoding='utf-8') as handle:
+            results = [json.loads(line) for line in handle if line.strip()]
+        for row in compare(results, *args.compare):
+            print(json.dumps(row))
+        return
+
+    logging.getLogger().setLevel(logging.WARNING)
+    mix = parse_mix(args.mix)
+    server = StandInServer(args.latency, args.jitter, args.rate_limit, args.error_rate, args.entries)
+    with server, open(args.output, 'a', encoding='utf-8') as output:
+        for mode in args.mode:
+            for concurrency in args.concurrency:
+                record = run_scenario(server, mode, mix, concurrency, args.duration)
+                record.update(label=args.label, server=server.config)
+                output.write(json.dumps(record) + '\n')
+                output.flush()
+                print(json.dumps(record))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+
+import threading
+import time
+
+from collections import deque
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected by an open circuit breaker and no stale data exists."""
+
+
+class LatencyTracker(object):
+    """
+    Rolling window of request latencies used to decide when to hedge.
+
+    Args:
+        window (int, optional): Number of samples kept (default is 100).
+        min_samples (int, optional): Samples needed before a quantile is reported.
+    """
+
+    def __init__(self, window=100, min_samples=20):
+        self.__samples__ = deque(maxlen=window)
+        self.__min_samples__ = min_samples
+        self.__lock__ = threading.Lock()
+
+    def add(self, seconds):
+        with self.__lock__:
+            self.__samples__.append(seconds)
+
+    def quantile(self, q):
+        """
+        Return the `q` quantile of the recorded latencies.
+
+        Args:
+            q (float): Quantile between 0 and 1, e.g. 0.95.
+
+        Returns:
+            float: Latency in seconds, or None if there are too few samples.
+        """
+        with self.__lock__:
+            if len(self.__samples__) < self.__min_samples__:
+                return None
+            samples = sorted(self.__samples__)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class CircuitBreaker(object):
+    """
+    Per-endpoint circuit breaker.
+
+    The breaker opens after `failure_threshold` consecutive failures, where a
+    failure is an exception, a 5xx response or a response slower than
+    `latency_threshold`. While open, calls are rejected; after `reset_timeout`
+    one trial call is let through (half-open) and closes the breaker on success.
+
+    Args:
+        failure_threshold (int, optional): Consecutive failures before opening.
+        latency_threshold (float, optional): Seconds after which a response counts
+            as a failure. None disables the latency check.
+        reset_timeout (float, optional): Seconds to stay open before a trial call.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, latency_threshold=None, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+        self.__state__ = self.CLOSED
+        self.__failures__ = 0
+        self.__opened_at__ = 0.0
+        self.__lock__ = threading.Lock()
+
+    @property
+    def state(self):
+        with self.__lock__:
+            return self.__state__
+
+    def allow(self):
+        """
+        Check whether a call may be sent.
+
+        Returns:
+            bool: True if the call may proceed.
+        """
+        with self.__lock__:
+            if self.__state__ == self.CLOSED:
+                return True
+            if self.__state__ == self.OPEN \
+                    and time.monotonic() - self.__opened_at__ >= self.reset_timeout:
+                self.__state__ = self.HALF_OPEN
+                return True
+            return False
+
+    def record(self, success, seconds=None):
+        """
+        Record the outcome of a call.
+
+        Args:
+            success (bool): Whether the call returned a non-5xx response.
+            seconds (float, optional): Latency of the call.
+        """
+        if success and seconds is not None and self.latency_threshold is not None:
+            success = seconds <= self.latency_threshold
+
+        with self.__lock__:
+            if success:
+                self.__state__ = self.CLOSED
+                self.__failures__ = 0
+                return
+
+            self.__failures__ += 1
+            if self.__state__ == self.HALF_OPEN \
+                    or self.__failures__ >= self.failure_threshold:
+                self.__state__ = self.OPEN
+                self.__opened_at__ = time.monotonic()
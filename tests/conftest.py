@@ -0,0 +1,105 @@
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+timeular = importlib.import_module(os.path.basename(ROOT))
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def __respond__(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        state = self.server.state
+        path = self.path.split('/api/v3/', 1)[-1]
+        with state['lock']:
+            state['calls'].append((self.command, path, body, dict(self.headers)))
+
+        with state['lock']:
+            delay = state['delays'].get(path.split('/')[0], 0)
+            if isinstance(delay, list):
+                delay = delay.pop(0) if delay else 0
+        time.sleep(delay)
+
+        if path == 'developer/sign-in':
+            return self.__send__(200, {'token': state['token']})
+        if self.headers.get('Authorization') != f"Bearer {state['token']}":
+            return self.__send__(401, {'message': 'Unauthorized'})
+        if path.split('/')[0] in state['failing']:
+            return self.__send__(500, {'message': 'Internal Server Error'})
+
+        routes = state['routes']
+        status, response, headers = routes.get(path, routes.get(path.split('/')[0], (200, {}, {})))
+        etag = headers.get('ETag')
+        if etag is not None and self.headers.get('If-None-Match') == etag:
+            return self.__send__(304, None, headers)
+        self.__send__(status, response, headers)
+
+    def __send__(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = __respond__
+
+
+@pytest.fixture
+def server():
+    """Local stand-in for the Timeular API.
+
+    `state['routes']` maps a path, or its first segment, to (status, body, headers), `state['delays']`
+    the first path segment to a delay in seconds, or a list of delays consumed
+    one per call, and `state['failing']` holds
+    first path segments answered with 500.
+    """
+    stand_in = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    stand_in.daemon_threads = True
+    stand_in.state = {
+        'token': 'token-1',
+        'routes': {'me': (200, {'data': {'userId': '1', 'defaultSpaceId': '1'}}, {})},
+        'delays': {},
+        'failing': set(),
+        'calls': [],
+        'lock': threading.Lock(),
+    }
+    stand_in.url = f'http://127.0.0.1:{stand_in.server_address[1]}/api/v3/'
+    thread = threading.Thread(target=stand_in.serve_forever, daemon=True)
+    thread.start()
+    yield stand_in
+    stand_in.shutdown()
+    stand_in.server_close()
+
+
+@pytest.fixture
+def client_factory(server):
+    """Build `TimeularAPI` instances pointing at the stand-in server."""
+    clients = []
+
+    def factory(**kwargs):
+        client = timeular.TimeularAPI('key', 'secret', 'UTC', **kwargs)
+        client.__baseurl__ = server.url
+        clients.append(client)
+        return client
+
+    yield factory
+    for client in clients:
+        client.__exit__(None, None, None)
@@ -0,0 +1,89 @@
+import datetime
+
+import pytest
+
+from conftest import timeular
+
+
+def entry(entry_id, started_at, stopped_at, text=None):
+    return {
+        'id': str(entry_id),
+        'activityId': '5',
+        'duration': {'startedAt': started_at, 'stoppedAt': stopped_at},
+        'note': {'text': text, 'tags': [{'id': 1}], 'mentions': []},
+    }
+
+
+JANUARY = [entry(1, '2024-01-10T09:00:00.000', '2024-01-10T10:00:00.000', 'jan')]
+MARCH = [
+    entry(2, '2024-03-01T09:00:00.000', '2024-03-01T10:00:00.000'),
+    entry(3, '2024-03-02T09:00:00.000', '2024-03-02T10:00:00.000'),
+]
+
+
+def test_round_trip(tmp_path):
+    with timeular.TimeEntryArchive(str(tmp_path)) as archive:
+        assert archive.append(JANUARY + MARCH, user_id=7) == 3
+
+    with timeular.TimeEntryArchive(str(tmp_path)) as archive:
+        assert len(archive) == 3
+        restored = archive.entries(datetime.datetime(2024, 1, 1), datetime.datetime(2024, 2, 1))
+        assert restored == [{
+            'id': '1',
+            'activityId': '5',
+            'userId': '7',
+            'duration': JANUARY[0]['duration'],
+            'note': {'text': 'jan', 'tags': [{'id': 1}], 'mentions': []},
+        }]
+
+
+def test_out_of_order_appends_keep_month_runs_separate(tmp_path):
+    with timeular.TimeEntryArchive(str(tmp_path)) as archive:
+        archive.append(MARCH[:1])
+        archive.append(JANUARY)
+        archive.append(MARCH[1:])
+
+        march = (datetime.datetime(2024, 3, 1), datetime.datetime(2024, 4, 1))
+        assert archive.positions(*march) == [(0, 1), (2, 3)]
+        assert [e['id'] for e in archive.entries(*march)] == ['2', '3']
+
+
+def test_out_of_order_numpy_view_excludes_other_months(tmp_path):
+    pytest.importorskip('numpy')
+    with timeular.TimeEntryArchive(str(tmp_path)) as archive:
+        archive.append(MARCH[:1])
+        archive.append(JANUARY)
+        archive.append(MARCH[1:])
+
+        view = archive.as_numpy(datetime.datetime(2024, 3, 1), datetime.datetime(2024, 4, 1))
+        assert list(view['id']) == [2, 3]
+
+
+def test_append_with_live_numpy_view(tmp_path):
+    pytest.importorskip('numpy')
+    with timeular.TimeEntryArchive(str(tmp_path)) as archive:
+        archive.append(JANUARY)
+        view = archive.as_numpy()
+
+        assert archive.append(MARCH) == 2
+        assert len(archive) == 3
+        assert list(archive.as_numpy()['id']) == [1, 2, 3]
+        assert list(view['id']) == [1]
+
+
+def test_reopen_indexes_records_missing_from_index(tmp_path):
+    with timeular.TimeEntryArchive(str(tmp_path)) as archive:
+        archive.append(JANUARY)
+    index = (tmp_path / 'index.json').read_bytes()
+    with timeular.TimeEntryArchive(str(tmp_path)) as archive:
+        archive.append(MARCH)
+    (tmp_path / 'index.json').write_bytes(index)
+    with open(tmp_path / 'entries.bin', 'ab') as handle:
+        handle.write(b'\0' * 5)
+
+    with timeular.TimeEntryArchive(str(tmp_path)) as archive:
+        assert len(archive) == 3
+        march = archive.entries(datetime.datetime(2024, 3, 1), datetime.datetime(2024, 4, 1))
+        assert [e['id'] for e in march] == ['2', '3']
+        assert archive.append(JANUARY) == 1
+        assert [e['id'] for e in archive.entries()] == ['1', '2', '3', '1']
@@ -0,0 +1,48 @@
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+def sign_ins(server):
+    return sum(1 for call in server.state['calls'] if call[1] == 'developer/sign-in')
+
+
+def test_signs_in_lazily(server, client_factory):
+    server.state['routes']['tracking'] = (200, {'currentTracking': None}, {})
+    api = client_factory()
+
+    assert api.get_current_tracking() is None
+    assert sign_ins(server) == 1
+
+
+def test_single_refresh_when_threads_hit_401(server, client_factory):
+    server.state['routes']['tracking'] = (200, {'currentTracking': None}, {})
+    server.state['delays']['tracking'] = 0.05
+    api = client_factory(pool_size=32)
+    api.get_current_tracking()
+
+    server.state['token'] = 'token-2'
+    barrier = threading.Barrier(32)
+
+    def call(_):
+        barrier.wait()
+        return api.get_current_tracking()
+
+    with ThreadPoolExecutor(32) as executor:
+        assert set(executor.map(call, range(32))) == {None}
+
+    assert sign_ins(server) == 2
+    assert api.get_metrics()['token_refreshes'] == 1
+
+
+def test_refresh_is_not_timed(server, client_factory):
+    server.state['routes']['tracking'] = (200, {'currentTracking': None}, {})
+    api = client_factory(circuit_breaker={'failure_threshold': 1, 'latency_threshold': 0.2})
+    api.get_current_tracking()
+
+    server.state['token'] = 'token-2'
+    server.state['delays'].update({'tracking': 0.08, 'developer': [0.15]})
+    assert api.get_current_tracking() is None
+
+    endpoint = api.get_metrics()['endpoints']['GET tracking']
+    assert endpoint['breaker'] == 'closed'
@@ -0,0 +1,39 @@
+from conftest import timeular
+
+
+ACTIVITIES = {'activities': [{'id': '5', 'name': 'Work'}]}
+
+
+def test_not_modified_returns_cached_object(server, client_factory):
+    server.state['routes']['activities'] = (200, ACTIVITIES, {'ETag': '"v1"'})
+    api = client_factory(cache=timeular.MemoryCache())
+
+    first = api.get_all_activities()
+    second = api.get_all_activities()
+
+    assert first == ACTIVITIES
+    assert second is first
+    requests = [call for call in server.state['calls'] if call[1] == 'activities']
+    assert 'If-None-Match' not in requests[0][3]
+    assert requests[1][3]['If-None-Match'] == '"v1"'
+    assert api.get_metrics()['not_modified'] == 1
+
+
+def test_changed_resource_replaces_cached_object(server, client_factory):
+    server.state['routes']['activities'] = (200, ACTIVITIES, {'ETag': '"v1"'})
+    api = client_factory(cache=timeular.MemoryCache())
+    api.get_all_activities()
+
+    server.state['routes']['activities'] = (200, {'activities': []}, {'ETag': '"v2"'})
+    assert api.get_all_activities() == {'activities': []}
+    assert api.get_all_activities() == {'activities': []}
+    assert api.get_metrics()['not_modified'] == 1
+
+
+def test_disk_cache_survives_restart(server, client_factory, tmp_path):
+    server.state['routes']['activities'] = (200, ACTIVITIES, {'ETag': '"v1"'})
+    client_factory(cache=timeular.DiskCache(str(tmp_path))).get_all_activities()
+
+    api = client_factory(cache=timeular.DiskCache(str(tmp_path)))
+    assert api.get_all_activities() == ACTIVITIES
+    assert api.get_metrics()['not_modified'] == 1
@@ -0,0 +1,62 @@
+import gzip
+import json
+
+from conftest import StandInHandler, timeular
+
+
+ENTRIES = {'timeEntries': [{'id': str(i), 'note': {'text': 'repetitive'}} for i in range(200)]}
+
+
+def gzip_response(handler, chunked):
+    data = gzip.compress(json.dumps(ENTRIES).encode('utf-8'))
+    handler.send_response(200)
+    handler.send_header('Content-Encoding', 'gzip')
+    if chunked:
+        handler.send_header('Transfer-Encoding', 'chunked')
+        handler.end_headers()
+        handler.wfile.write(b'%x\r\n%s\r\n0\r\n\r\n' % (len(data), data))
+    else:
+        handler.send_header('Content-Length', str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+    return len(data)
+
+
+def test_get_requests_have_no_body(server, client_factory):
+    server.state['routes']['tracking'] = (200, {'currentTracking': None}, {})
+    client_factory().get_current_tracking()
+
+    method, path, body, headers = server.state['calls'][-1]
+    assert (method, path, body) == ('GET', 'tracking', b'')
+    assert 'gzip' in headers['Accept-Encoding']
+
+
+def test_codecs_round_trip():
+    codec = timeular.codec.get_codec('json')
+    assert codec.loads(codec.dumps(ENTRIES)) == ENTRIES
+    assert timeular.codec.get_codec(codec) is codec
+
+
+def test_wire_bytes_of_compressed_responses(server, client_factory, monkeypatch):
+    sizes = []
+    respond = StandInHandler.__respond__
+
+    def compressed(handler):
+        if handler.path.endswith('/chunked') or handler.path.endswith('/sized'):
+            handler.rfile.read(int(handler.headers.get('Content-Length') or 0))
+            sizes.append(gzip_response(handler, handler.path.endswith('/chunked')))
+        else:
+            respond(handler)
+
+    monkeypatch.setattr(StandInHandler, 'do_GET', compressed)
+    api = client_factory()
+
+    api.__api_request__('GET', server.url + 'sized')
+    api.__api_request__('GET', server.url + 'chunked')
+
+    metrics = api.get_metrics()
+    decoded = len(json.dumps(ENTRIES))
+    assert metrics['response_bytes'] == 2 * decoded
+    assert metrics['wire_bytes'] == sizes[0]
+    assert metrics['wire_decoded_bytes'] == decoded
+    assert metrics['wire_unmeasured'] == 1
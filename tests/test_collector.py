@@ -0,0 +1,40 @@
+import datetime
+
+from conftest import timeular
+
+
+def entry(entry_id, activity_id, started_at, stopped_at):
+    return {
+        'id': entry_id,
+        'activityId': activity_id,
+        'duration': {'startedAt': started_at, 'stoppedAt': stopped_at},
+        'note': {'text': None, 'tags': [], 'mentions': []},
+    }
+
+
+def test_collect_spaces_deduplicates_and_keeps_archived_activities(server, client_factory):
+    crossing = entry('10', '5', '2024-01-01T23:00:00.000', '2024-01-02T01:00:00.000')
+    archived = entry('11', '6', '2024-01-02T09:00:00.000', '2024-01-02T10:00:00.000')
+    orphan = entry('12', '99', '2024-01-02T11:00:00.000', '2024-01-02T12:00:00.000')
+    server.state['routes'].update({
+        'space': (200, {'data': [{'id': '1', 'members': [{'id': '1'}]}]}, {}),
+        'activities': (200, {
+            'activities': [{'id': '5', 'spaceId': '1'}],
+            'inactiveActivities': [],
+            'archivedActivities': [{'id': '6', 'spaceId': '1'}],
+        }, {}),
+        'tags-and-mentions': (200, {'tags': [{'id': 1, 'spaceId': '1'}], 'mentions': []}, {}),
+        'time-entries/2024-01-01T00:00:00.000/2024-01-02T00:00:00.000':
+            (200, {'timeEntries': [crossing]}, {}),
+        'time-entries/2024-01-02T00:00:00.000/2024-01-03T00:00:00.000':
+            (200, {'timeEntries': [crossing, archived, orphan]}, {}),
+    })
+    api = client_factory()
+
+    result = api.collect_spaces(datetime.datetime(2024, 1, 1), datetime.datetime(2024, 1, 3),
+                                window=datetime.timedelta(days=1))
+
+    assert [e['id'] for e in result['1']['timeEntries']] == ['10', '11']
+    assert [e['id'] for e in result['1']['members']['1']['timeEntries']] == ['10', '11']
+    assert result['1']['tags'] == [{'id': 1, 'spaceId': '1'}]
+    assert [e['id'] for e in result[timeular.collector.UNASSIGNED]['timeEntries']] == ['12']
@@ -0,0 +1,42 @@
+import datetime
+import time
+
+
+START = datetime.datetime(2024, 1, 1)
+DAY = datetime.timedelta(days=1)
+
+
+def fetched_windows(server):
+    return [call[1] for call in server.state['calls'] if call[1].startswith('time-entries/')]
+
+
+def test_next_and_previous_are_served_from_readahead(server, client_factory):
+    server.state['routes']['time-entries'] = (200, {'timeEntries': []}, {})
+    server.state['delays']['time-entries'] = 0.2
+    api = client_factory()
+
+    with api.entries_cursor(START, prefetch=2) as cursor:
+        cursor.entries()
+        time.sleep(0.3)
+
+        started = time.monotonic()
+        cursor.next()
+        cursor.previous()
+        assert time.monotonic() - started < 0.1
+
+    windows = fetched_windows(server)
+    assert len(windows) == len(set(windows))
+
+
+def test_jump_does_not_wait_behind_stale_prefetches(server, client_factory):
+    server.state['routes']['time-entries'] = (200, {'timeEntries': []}, {})
+    server.state['delays']['time-entries'] = 0.3
+    api = client_factory()
+    api.sign_in()
+
+    with api.entries_cursor(START, prefetch=2) as cursor:
+        time.sleep(0.05)
+        started = time.monotonic()
+        cursor.jump(START + 30 * DAY)
+        assert time.monotonic() - started < 0.45
+        assert cursor.start == START + 30 * DAY
@@ -0,0 +1,56 @@
+import argparse
+import importlib
+
+import pytest
+
+from conftest import timeular
+
+loadtest = importlib.import_module(timeular.__name__ + '.loadtest')
+
+KEYS = {
+    'mode', 'mix', 'concurrency', 'duration', 'calls', 'errors', 'throughput',
+    'p50_ms', 'p95_ms', 'p99_ms', 'cpu_seconds', 'max_rss_kib', 'worker_max_rss_kib',
+}
+
+
+@pytest.fixture(scope='module')
+def stand_in():
+    with loadtest.StandInServer(latency=0.005, jitter=0.0, entries=10) as server:
+        yield server
+
+
+@pytest.mark.parametrize('mode', sorted(loadtest.MODES))
+def test_run_scenario(stand_in, mode):
+    mix = loadtest.parse_mix(['get_current_tracking=3', 'get_time_entries_in_range'])
+    record = loadtest.run_scenario(stand_in, mode, mix, 2, 0.2)
+
+    assert set(record) == KEYS
+    assert record['mode'] == mode
+    assert record['mix'] == {'get_current_tracking': 3.0, 'get_time_entries_in_range': 1.0}
+    assert record['calls'] > 0
+    assert record['errors'] == 0
+    assert 0 < record['p50_ms'] <= record['p95_ms'] <= record['p99_ms']
+
+
+def test_compare():
+    mix = {'get_current_tracking': 1.0}
+    results = [
+        {'label': 'a', 'mode': 'threads', 'mix': mix, 'concurrency': 8, 'throughput': 100.0, 'p95_ms': 20.0},
+        {'label': 'b', 'mode': 'threads', 'mix': mix, 'concurrency': 8, 'throughput': 120.0, 'p95_ms': 15.0},
+        {'label': 'b', 'mode': 'asyncio', 'mix': mix, 'concurrency': 8, 'throughput': 90.0, 'p95_ms': 25.0},
+    ]
+
+    assert loadtest.compare(results, 'a', 'b') == [{
+        'mode': 'threads',
+        'mix': mix,
+        'concurrency': 8,
+        'throughput_change': 0.2,
+        'p95_change': -0.25,
+    }]
+
+
+def test_percentile_and_parse_mix():
+    assert loadtest.percentile([], 0.95) is None
+    assert loadtest.percentile([1, 2, 3, 4], 0.5) == 3
+    with pytest.raises(argparse.ArgumentTypeError):
+        loadtest.parse_mix(['unknown_call'])
@@ -0,0 +1,101 @@
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import timeular
+
+
+def test_breaker_serves_stale_while_open_and_recovers(server, client_factory):
+    server.state['routes']['activities'] = (200, {'activities': [{'id': '5'}]}, {})
+    api = client_factory(circuit_breaker={'failure_threshold': 2, 'reset_timeout': 0.2})
+    breaker_state = lambda: api.get_metrics()['endpoints']['GET activities']['breaker']
+
+    assert api.get_all_activities() == {'activities': [{'id': '5'}]}
+
+    server.state['failing'].add('activities')
+    api.get_all_activities()
+    api.get_all_activities()
+    assert breaker_state() == 'open'
+
+    calls = len(server.state['calls'])
+    assert api.get_all_activities() == {'activities': [{'id': '5'}]}
+    assert len(server.state['calls']) == calls
+    assert api.get_metrics()['stale_served'] == 1
+
+    server.state['failing'].clear()
+    time.sleep(0.25)
+    assert api.get_all_activities() == {'activities': [{'id': '5'}]}
+    assert breaker_state() == 'closed'
+
+
+def test_breaker_rejects_without_stale_data(server, client_factory):
+    server.state['failing'].add('devices')
+    api = client_factory(circuit_breaker={'failure_threshold': 1, 'reset_timeout': 60})
+
+    with pytest.raises(KeyError):
+        api.get_all_known_devices()
+    with pytest.raises(timeular.CircuitOpenError):
+        api.get_all_known_devices()
+
+
+def test_half_open_trial_failing_outside_http_reopens(server, client_factory, monkeypatch):
+    server.state['routes']['tracking'] = (200, {'currentTracking': None}, {})
+    api = client_factory(circuit_breaker={'failure_threshold': 1, 'reset_timeout': 0.1})
+    breaker_state = lambda: api.get_metrics()['endpoints']['GET tracking']['breaker']
+
+    server.state['failing'].add('tracking')
+    with pytest.raises(KeyError):
+        api.get_current_tracking()
+    assert breaker_state() == 'open'
+
+    def failing_refresh(token):
+        raise KeyError('token')
+
+    time.sleep(0.15)
+    server.state['failing'].clear()
+    server.state['token'] = 'token-2'
+    monkeypatch.setattr(api, '__refresh_token__', failing_refresh)
+    with pytest.raises(KeyError):
+        api.get_current_tracking()
+    assert breaker_state() == 'open'
+
+    monkeypatch.undo()
+    time.sleep(0.15)
+    assert api.get_current_tracking() is None
+    assert breaker_state() == 'closed'
+
+
+def test_hedge_returns_before_slow_first_attempt(server, client_factory):
+    server.state['routes']['tracking'] = (200, {'currentTracking': None}, {})
+    api = client_factory(hedge_requests=True)
+    for _ in range(25):
+        api.get_current_tracking()
+    # let hedges sent while warming up finish before the stall is injected
+    time.sleep(0.2)
+
+    before = api.get_metrics()
+    p95 = before['endpoints']['GET tracking']['p95']
+    server.state['delays']['tracking'] = [3.0]
+    started = time.monotonic()
+    assert api.get_current_tracking() is None
+    elapsed = time.monotonic() - started
+
+    assert elapsed < p95 + 0.5
+    after = api.get_metrics()
+    assert after['hedged'] - before['hedged'] == 1
+    assert after['hedge_wins'] - before['hedge_wins'] == 1
+
+
+def test_hedges_are_capped_by_budget(server, client_factory):
+    server.state['routes']['tracking'] = (200, {'currentTracking': None}, {})
+    api = client_factory(hedge_requests=True, hedge_budget=0.1, pool_size=20)
+    for _ in range(25):
+        api.get_current_tracking()
+
+    server.state['delays']['tracking'] = 0.2
+    with ThreadPoolExecutor(20) as executor:
+        list(executor.map(lambda _: api.get_current_tracking(), range(20)))
+
+    assert api.get_metrics()['hedged'] <= 4